@@ -1,16 +1,30 @@
 # Copyright (c) ZhiPu Corporation.
 # Licensed under the MIT License.
 
-import json
+import asyncio
+import random
 import uuid
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
 from typing import Any, Optional
 
-from aiohttp import ClientSession, WSMsgType, WSServerHandshakeError
+import orjson
+from aiohttp import ClientError, ClientSession, TCPConnector, WSMsgType, WSServerHandshakeError
+from pydantic import BaseModel, TypeAdapter
 
 from rtclient.models import ServerMessageType, UserMessageType, create_message_from_dict
 from rtclient.util.user_agent import get_user_agent
 
+# 按消息类型缓存TypeAdapter：序列化器只编译一次，音频/视频等高频消息免去每次的schema遍历
+_ADAPTERS: dict[type, TypeAdapter] = {}
+
+
+def _dump_message(message: BaseModel) -> str:
+    message_type = type(message)
+    adapter = _ADAPTERS.get(message_type)
+    if adapter is None:
+        adapter = _ADAPTERS[message_type] = TypeAdapter(message_type)
+    return adapter.dump_json(message).decode()
+
 
 class ConnectionError(Exception):
     def __init__(self, message: str, headers=None):
@@ -24,6 +38,11 @@ class RTLowLevelClient:
         url: str,
         headers: Optional[dict[str, str]] = None,
         params: Optional[dict[str, Any]] = None,
+        max_retries: int = 3,
+        initial_retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+        heartbeat: Optional[float] = 20.0,
+        on_reconnect: Optional[Callable] = None,
     ):
         """初始化WebSocket客户端
 
@@ -31,31 +50,106 @@ class RTLowLevelClient:
             url: WebSocket服务器地址
             headers: 请求头
             params: URL参数
+            max_retries: 连接失败后的最大重试次数
+            initial_retry_delay: 首次重试延迟（秒）
+            max_retry_delay: 重试延迟上限（秒）
+            heartbeat: WebSocket心跳间隔（秒），传None关闭心跳
+            on_reconnect: 重连成功后的回调，可用于立即重发session.update等会话状态
         """
         self._url = url
         self._headers = headers or {}
+        self._connect_headers = {"User-Agent": get_user_agent(), **self._headers}
         self._params = params or {}
-        self._session = ClientSession()
+        # 复用同一个session：DNS缓存+TCP保活让重连免去getaddrinfo和冷握手
+        self._session = ClientSession(connector=TCPConnector(ttl_dns_cache=300, keepalive_timeout=75))
+        self._max_retries = max_retries
+        self._initial_retry_delay = initial_retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._retry_count = 0
+        self._last_delay = initial_retry_delay
+        # 实例私有RNG：多个客户端共存时不争用random模块的全局状态
+        self._rng = random.Random()
+        self._reconnecting = False
+        self._heartbeat = heartbeat
+        self._on_reconnect = on_reconnect
+        self._prewarm_task: Optional[asyncio.Task] = None
         self.request_id: Optional[uuid.UUID] = None
         self.ws = None
 
+    def prewarm(self) -> asyncio.Task:
+        """提前在后台发起连接握手
+
+        TCP+TLS+WS握手通常需要数百毫秒，可与CPU密集型准备工作（如base64编码）
+        并行执行；之后调用connect()会直接等待该后台任务完成。
+
+        Returns:
+            后台连接任务
+        """
+        if self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self._connect_with_retry())
+        return self._prewarm_task
+
     async def connect(self):
-        """连接到WebSocket服务器"""
+        """连接到WebSocket服务器，失败时按抖动退避自动重试"""
+        if self._prewarm_task is not None:
+            task = self._prewarm_task
+            try:
+                await task
+            finally:
+                # 只在任务真正结束后才丢弃引用：本协程被取消时后台任务仍在运行，
+                # 保留引用close()才能取消它
+                if task.done():
+                    self._prewarm_task = None
+            return
+        await self._connect_with_retry()
+
+    async def _connect_with_retry(self):
+        """带重试的连接流程"""
+        while True:
+            try:
+                await self._do_connect()
+                return
+            except WSServerHandshakeError as e:
+                await self._handle_connection_failure(e)
+
+    async def _do_connect(self):
+        """执行一次连接握手"""
+        self.request_id = uuid.uuid4()
+        self.ws = await self._session.ws_connect(
+            self._url,
+            headers=self._connect_headers,
+            params=self._params,
+            heartbeat=self._heartbeat
+        )
+        # 在清零重试状态前记录本次是否为重连，否则回调永远不会触发
+        was_reconnect = self._retry_count > 0 or self._reconnecting
+        self._retry_count = 0
+        self._last_delay = self._initial_retry_delay
+        if was_reconnect and self._on_reconnect is not None:
+            result = self._on_reconnect()
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def _handle_connection_failure(self, error: WSServerHandshakeError):
+        """连接失败处理：客户端错误或重试耗尽时抛出，否则退避后由connect重试"""
+        if 400 <= error.status < 500 or self._retry_count >= self._max_retries:
+            error_message = f"连接服务器失败，状态码: {error.status}"
+            raise ConnectionError(error_message, error.headers) from error
+        self._retry_count += 1
+        # 去相关抖动(decorrelated jitter)：延迟在[initial, last*3]区间均匀取值并封顶，
+        # 将多个客户端的重试时刻摊开，避免在固定的1/2/4/8秒点上形成重连风暴
+        self._last_delay = min(
+            self._max_retry_delay, self._rng.uniform(self._initial_retry_delay, self._last_delay * 3)
+        )
+        await asyncio.sleep(self._last_delay)
+
+    async def reconnect(self):
+        """断线后重新建立连接"""
+        self._reconnecting = True
         try:
-            self.request_id = uuid.uuid4()
-            headers = {
-                "User-Agent": get_user_agent(),
-                **self._headers
-            }
-            self.ws = await self._session.ws_connect(
-                self._url,
-                headers=headers,
-                params=self._params
-            )
-        except WSServerHandshakeError as e:
-            await self._session.close()
-            error_message = f"连接服务器失败，状态码: {e.status}"
-            raise ConnectionError(error_message, e.headers) from e
+            await self._connect_with_retry()
+        finally:
+            self._reconnecting = False
 
     async def send(self, message: UserMessageType | dict[str, Any]):
         """发送消息到服务器
@@ -63,11 +157,34 @@ class RTLowLevelClient:
         Args:
             message: 要发送的消息，可以是 UserMessageType 或 dict
         """
-        if hasattr(message, 'model_dump_json'):
-            message_data = message.model_dump_json()
+        if isinstance(message, BaseModel):
+            message_data = _dump_message(message)
         else:
-            message_data = json.dumps(message)
-        await self.ws.send_str(message_data)
+            message_data = orjson.dumps(message).decode()
+        ws = self.ws
+        try:
+            await ws.send_str(message_data)
+        except (ClientError, ConnectionResetError):
+            # 重连后复用已序列化的载荷，避免pydantic再次遍历整个模型；
+            # 重连会替换self.ws，这里必须重新取引用
+            await self.reconnect()
+            await self.ws.send_str(message_data)
+
+    async def send_batch(self, messages: list[UserMessageType | dict[str, Any]]):
+        """按顺序连续发送一批消息
+
+        先把所有消息序列化完，再逐条写出，帧之间不再穿插序列化工作，
+        写出尽可能背靠背地进入发送缓冲区。
+
+        Args:
+            messages: 要发送的消息列表
+        """
+        payloads = [
+            _dump_message(m) if isinstance(m, BaseModel) else orjson.dumps(m).decode() for m in messages
+        ]
+        ws = self.ws
+        for payload in payloads:
+            await ws.send_str(payload)
 
     async def send_json(self, message: dict[str, Any]):
         """发送JSON消息到服务器
@@ -75,7 +192,7 @@ class RTLowLevelClient:
         Args:
             message: 要发送的JSON消息
         """
-        await self.ws.send_json(message)
+        await self.ws.send_str(orjson.dumps(message).decode())
 
     async def recv(self) -> Optional[ServerMessageType]:
         """接收服务器消息
@@ -83,11 +200,23 @@ class RTLowLevelClient:
         Returns:
             接收到的消息对象
         """
-        if self.ws.closed:
+        ws = self.ws
+        if ws is None or ws.closed:
+            return None
+        try:
+            websocket_message = await ws.receive()
+        except asyncio.CancelledError:
+            # 取消必须原样传播，协程才能被干净地关闭
+            raise
+        except (ClientError, TimeoutError):
+            # 连接级错误视同连接关闭，由调用方决定是否重连
             return None
-        websocket_message = await self.ws.receive()
         if websocket_message.type == WSMsgType.TEXT:
-            data = json.loads(websocket_message.data)
+            try:
+                data = orjson.loads(websocket_message.data)
+            except orjson.JSONDecodeError:
+                # 单帧解码失败只丢弃该帧，不影响整条连接
+                return None
             msg = create_message_from_dict(data)
             return msg
         else:
@@ -104,6 +233,15 @@ class RTLowLevelClient:
 
     async def close(self):
         """关闭连接"""
+        # 先取消可能仍在后台重试的预热连接任务，避免其在事件循环关闭后残留
+        if self._prewarm_task is not None:
+            if not self._prewarm_task.done():
+                self._prewarm_task.cancel()
+            try:
+                await self._prewarm_task
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+            self._prewarm_task = None
         if self.ws:
             await self.ws.close()
         await self._session.close()
@@ -114,7 +252,12 @@ class RTLowLevelClient:
         return self.ws.closed if self.ws else True
 
     async def __aenter__(self):
-        await self.connect()
+        try:
+            await self.connect()
+        except ConnectionError:
+            # __aenter__抛出时__aexit__不会执行，这里必须释放session，否则连接失败会泄漏连接池
+            await self.close()
+            raise
         return self
 
     async def __aexit__(self, *args):
@@ -2,15 +2,14 @@
 # Licensed under the MIT license.
 
 import asyncio
-import base64
 import os
 import signal
 import sys
 import wave
-from io import BytesIO
 from typing import Optional
 
 from dotenv import load_dotenv
+from media_utils import encode_file_to_base64
 from message_handler import create_message_handler
 
 from rtclient import RTLowLevelClient
@@ -34,62 +33,43 @@ def handle_shutdown(sig=None, frame=None):
 
 def encode_wave_to_base64(wave_file_path):
     """
-    将WAV文件转换为base64编码，确保生成标准的WAV格式
+    将WAV文件转换为base64编码
     Args:
         wave_file_path: WAV文件路径
     Returns:
         base64编码的字符串
     """
     try:
+        # 只读取文件头验证音频参数，不把音频帧读入内存
         with wave.open(wave_file_path, "rb") as wave_file:
-            # 获取音频参数
             channels = wave_file.getnchannels()
             sample_width = wave_file.getsampwidth()
             frame_rate = wave_file.getframerate()
-            frames = wave_file.readframes(wave_file.getnframes())
 
             # 验证音频参数是否合法
             if channels < 1 or sample_width < 1 or frame_rate <= 0:
                 print(f"无效的音频参数: channels={channels}, sample_width={sample_width}, frame_rate={frame_rate}")
                 return None
 
-            # 创建字节流并写入标准WAV格式
-            wave_io = BytesIO()
-            with wave.open(wave_io, "wb") as wave_out:
-                # 设置WAV文件头部信息
-                wave_out.setnchannels(channels)
-                wave_out.setsampwidth(sample_width)  # 位深度 (1 = 8位, 2 = 16位, etc.)
-                wave_out.setframerate(frame_rate)  # 采样率 (常见值: 44100, 48000)
-                # 写入音频数据
-                wave_out.writeframes(frames)
-
-            # 确保写入完整的WAV文件数据
-            wave_io.seek(0)
-
-            # 获取字节数据并编码为base64
             print(f"音频参数: 声道数={channels}, 位深度={sample_width*8}位, 采样率={frame_rate}Hz")
-            return base64.b64encode(wave_io.getvalue()).decode("utf-8")
+
+        # 文件本身已是合法的WAV，直接分块编码原始字节，跳过BytesIO重建
+        return encode_file_to_base64(wave_file_path)
     except Exception as e:
         print(f"音频文件处理错误: {str(e)}")
         return None
 
 
-async def send_audio(client: RTLowLevelClient, audio_file_path: str):
-    """发送音频"""
-    base64_content = encode_wave_to_base64(audio_file_path)
-    if base64_content is None:
-        print("音频编码失败")
-        return
-
+async def send_audio(client: RTLowLevelClient, base64_content: str):
+    """发送已编码好的音频数据"""
     # 验证音频数据长度
     if len(base64_content) == 0:
         print("音频数据为空")
         return
 
     # 发送音频数据
-    audio_message = InputAudioBufferAppendMessage(
-        audio=base64_content, client_timestamp=int(asyncio.get_event_loop().time() * 1000)
-    )
+    loop = asyncio.get_running_loop()
+    audio_message = InputAudioBufferAppendMessage(audio=base64_content, client_timestamp=int(loop.time() * 1000))
     await client.send(audio_message)
 
 
@@ -109,9 +89,18 @@ async def with_zhipu(audio_file_path: str):
 
     api_key = get_env_var("ZHIPU_API_KEY")
     try:
-        async with RTLowLevelClient(
+        client = RTLowLevelClient(
             url="wss://open.bigmodel.cn/api/paas/v4/realtime", headers={"Authorization": f"Bearer {api_key}"}
-        ) as client:
+        )
+        # 提前在后台发起握手，与工作线程中的音频编码并行进行
+        client.prewarm()
+        base64_content = await asyncio.to_thread(encode_wave_to_base64, audio_file_path)
+        if base64_content is None:
+            print("音频编码失败")
+            await client.close()
+            return
+
+        async with client:
             # 发送会话配置
             if shutdown_event.is_set():
                 return
@@ -134,13 +123,13 @@ async def with_zhipu(audio_file_path: str):
             # 创建消息处理器
             message_handler = await create_message_handler(client, shutdown_event)
 
+            loop = asyncio.get_running_loop()
+
             async def send_audio_with_commit():
                 # 发送音频数据
-                await send_audio(client, audio_file_path)
+                await send_audio(client, base64_content)
                 # 提交音频缓冲区
-                commit_message = InputAudioBufferCommitMessage(
-                    client_timestamp=int(asyncio.get_event_loop().time() * 1000)
-                )
+                commit_message = InputAudioBufferCommitMessage(client_timestamp=int(loop.time() * 1000))
                 await client.send(commit_message)
                 # 发送创建响应的消息
                 await client.send_json({"type": "response.create"})
@@ -154,14 +143,13 @@ async def with_zhipu(audio_file_path: str):
                 await asyncio.gather(send_task, receive_task)
             except Exception as e:
                 print(f"任务执行出错: {e}")
-                # 取消未完成的任务
-                for task in [send_task, receive_task]:
+            finally:
+                # 无论正常结束还是异常退出都取消未完成的任务，
+                # 避免事件循环关闭时遗留pending任务（"Task was destroyed"警告）
+                for task in (send_task, receive_task):
                     if not task.done():
                         task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
+                await asyncio.gather(send_task, receive_task, return_exceptions=True)
     except Exception as e:
         print(f"发生错误: {e}")
     finally:
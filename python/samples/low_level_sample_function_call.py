@@ -2,13 +2,13 @@
 # Licensed under the MIT license.
 
 import asyncio
-import base64
 import os
 import signal
 import sys
 from typing import Optional
 
 from dotenv import load_dotenv
+from media_utils import encode_file_to_base64
 from message_handler import create_message_handler
 
 from rtclient import RTLowLevelClient
@@ -32,8 +32,8 @@ def handle_shutdown(sig=None, frame=None):
 def encode_wave_to_base64(wave_file_path):
     """将WAV文件转换为base64编码"""
     try:
-        with open(wave_file_path, "rb") as audio_file:
-            return base64.b64encode(audio_file.read()).decode("utf-8")
+        # 分块读取并编码，不把整个文件一次性读入内存
+        return encode_file_to_base64(wave_file_path)
     except Exception as e:
         print(f"音频文件处理错误: {str(e)}")
         return None
@@ -41,15 +41,15 @@ def encode_wave_to_base64(wave_file_path):
 
 async def send_audio(client: RTLowLevelClient, audio_file_path: str):
     """发送音频"""
-    base64_content = encode_wave_to_base64(audio_file_path)
+    # 在工作线程中编码，避免阻塞事件循环
+    base64_content = await asyncio.to_thread(encode_wave_to_base64, audio_file_path)
     if base64_content is None:
         print("音频编码失败")
         return
 
     # 发送音频数据
-    audio_message = InputAudioBufferAppendMessage(
-        audio=base64_content, client_timestamp=int(asyncio.get_event_loop().time() * 1000)
-    )
+    loop = asyncio.get_running_loop()
+    audio_message = InputAudioBufferAppendMessage(audio=base64_content, client_timestamp=int(loop.time() * 1000))
     await client.send(audio_message)
 
 
@@ -107,13 +107,13 @@ async def with_zhipu(audio_file_path: str):
             # 创建消息处理器
             message_handler = await create_message_handler(client, shutdown_event)
 
+            loop = asyncio.get_running_loop()
+
             async def send_audio_with_commit():
                 # 发送音频数据
                 await send_audio(client, audio_file_path)
                 # 提交音频缓冲区
-                commit_message = InputAudioBufferCommitMessage(
-                    client_timestamp=int(asyncio.get_event_loop().time() * 1000)
-                )
+                commit_message = InputAudioBufferCommitMessage(client_timestamp=int(loop.time() * 1000))
                 await client.send(commit_message)
                 # 发送创建响应的消息
                 await client.send_json({"type": "response.create"})
@@ -127,14 +127,13 @@ async def with_zhipu(audio_file_path: str):
                 await asyncio.gather(send_task, receive_task)
             except Exception as e:
                 print(f"任务执行出错: {e}")
-                # 取消未完成的任务
-                for task in [send_task, receive_task]:
+            finally:
+                # 无论正常结束还是异常退出都取消未完成的任务，
+                # 避免事件循环关闭时遗留pending任务（"Task was destroyed"警告）
+                for task in (send_task, receive_task):
                     if not task.done():
                         task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
+                await asyncio.gather(send_task, receive_task, return_exceptions=True)
     except Exception as e:
         print(f"发生错误: {e}")
     finally:
@@ -61,6 +61,9 @@ async def send_audio(client: RTLowLevelClient, audio_file_path: str):
         bytes_per_sample = sample_width * channels
         packet_bytes = packet_samples * bytes_per_sample  # 每包字节数
 
+        # 循环外取一次事件循环引用，不在每包上重复查找
+        loop = asyncio.get_running_loop()
+
         # 按100ms一包分帧发送
         for pos in range(0, len(audio_data), packet_bytes):
             # 提取当前包数据
@@ -80,7 +83,7 @@ async def send_audio(client: RTLowLevelClient, audio_file_path: str):
             wav_io.seek(0)
             base64_data = base64.b64encode(wav_io.getvalue()).decode("utf-8")
             message = InputAudioBufferAppendMessage(
-                audio=base64_data, client_timestamp=int(asyncio.get_event_loop().time() * 1000)
+                audio=base64_data, client_timestamp=int(loop.time() * 1000)
             )
 
             try:
@@ -142,13 +145,13 @@ async def with_zhipu(audio_file_path: str):
                 await asyncio.gather(send_task, receive_task)
             except Exception as e:
                 print(f"任务执行出错: {e}")
-                for task in [send_task, receive_task]:
+            finally:
+                # 无论正常结束还是异常退出都取消未完成的任务，
+                # 避免事件循环关闭时遗留pending任务（"Task was destroyed"警告）
+                for task in (send_task, receive_task):
                     if not task.done():
                         task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
+                await asyncio.gather(send_task, receive_task, return_exceptions=True)
     except Exception as e:
         print(f"发生错误: {e}")
     finally:
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import os
 import signal
 import sys
@@ -7,6 +6,7 @@ import time
 from typing import Optional
 
 from dotenv import load_dotenv
+from media_utils import encode_file_to_base64
 from message_handler import create_message_handler
 
 from rtclient import RTLowLevelClient
@@ -38,8 +38,7 @@ def encode_image_to_base64(image_path: str) -> str:
         base64编码的字符串
     """
     try:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+        return encode_file_to_base64(image_path)
     except Exception as e:
         print(f"图片文件处理错误: {str(e)}")
         return None
@@ -47,11 +46,10 @@ def encode_image_to_base64(image_path: str) -> str:
 
 async def send_media(client: RTLowLevelClient, audio_file_path: str, image_file_path: str):
     """发送音频和视频帧，实现异步发送和时间戳管理"""
-    # 编码音频和图片
-    with open(audio_file_path, "rb") as audio_file:
-        audio_base64 = base64.b64encode(audio_file.read()).decode("utf-8")
+    # 在工作线程中编码音频和图片，避免阻塞事件循环（接收任务可继续处理消息）
+    audio_base64 = await asyncio.to_thread(encode_file_to_base64, audio_file_path)
 
-    image_base64 = encode_image_to_base64(image_file_path)
+    image_base64 = await asyncio.to_thread(encode_image_to_base64, image_file_path)
     if image_base64 is None:
         print("图片编码失败")
         return
@@ -65,13 +63,18 @@ async def send_media(client: RTLowLevelClient, audio_file_path: str, image_file_
         await client.send(audio_message)
 
     async def send_video():
-        """异步发送视频帧"""
+        """异步发送视频帧，按绝对时间点调度，避免"发送耗时+sleep"累积的节拍漂移"""
+        loop = asyncio.get_running_loop()
+        # 复用同一个消息对象，每帧只刷新时间戳，避免重复构造携带整幅图像的消息
+        video_message = InputVideoFrameAppendMessage(video_frame=image_base64, client_timestamp=base_timestamp)
         video_timestamp = base_timestamp
+        next_t = loop.time()
         for _ in range(2):  # 2fps
-            video_message = InputVideoFrameAppendMessage(video_frame=image_base64, client_timestamp=video_timestamp)
+            video_message.client_timestamp = video_timestamp
             await client.send(video_message)
             video_timestamp += VIDEO_INTERVAL
-            await asyncio.sleep(VIDEO_INTERVAL / 1000)
+            next_t += VIDEO_INTERVAL / 1000
+            await asyncio.sleep(max(0, next_t - loop.time()))
 
     # 创建音频和视频的异步任务
     audio_task = asyncio.create_task(send_audio())
@@ -80,12 +83,9 @@ async def send_media(client: RTLowLevelClient, audio_file_path: str, image_file_
     # 等待所有任务完成
     await asyncio.gather(audio_task, video_task)
 
-    # 发送音频缓冲区提交信号
+    # 音频缓冲区提交信号和创建响应消息作为一批连续发送
     commit_message = InputAudioBufferCommitMessage(client_timestamp=int(time.time() * 1000))
-    await client.send(commit_message)
-
-    # 发送创建响应的消息
-    await client.send_json({"type": "response.create"})
+    await client.send_batch([commit_message, {"type": "response.create"}])
 
 
 def get_env_var(var_name: str) -> str:
@@ -138,14 +138,13 @@ async def with_zhipu(audio_file_path: str, image_file_path: str):
                 await asyncio.gather(send_task, receive_task)
             except Exception as e:
                 print(f"任务执行出错: {e}")
-                # 取消未完成的任务
-                for task in [send_task, receive_task]:
+            finally:
+                # 无论正常结束还是异常退出都取消未完成的任务，
+                # 避免事件循环关闭时遗留pending任务（"Task was destroyed"警告）
+                for task in (send_task, receive_task):
                     if not task.done():
                         task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
+                await asyncio.gather(send_task, receive_task, return_exceptions=True)
     except Exception as e:
         print(f"发生错误: {e}")
     finally:
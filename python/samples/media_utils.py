@@ -0,0 +1,27 @@
+# Copyright (c) ZhiPu Corporation.
+# Licensed under the MIT license.
+
+"""
+样例共用的媒体编码工具
+分块读取文件并编码base64，避免"整体读入再整体编码"带来的双倍峰值内存
+"""
+
+import base64
+
+# 分块大小取3的倍数，保证每块的base64输出可以直接拼接
+_CHUNK_SIZE = 57 * 1024
+
+
+def encode_file_to_base64(file_path: str) -> str:
+    """
+    分块读取文件并编码为base64字符串
+    Args:
+        file_path: 文件路径
+    Returns:
+        base64编码的字符串
+    """
+    encoded = bytearray()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            encoded += base64.b64encode(chunk)
+    return bytes(encoded).decode("ascii")
@@ -6,6 +6,7 @@
 
 import asyncio
 import json
+import os
 from collections.abc import Callable
 from typing import Any, Optional
 
@@ -15,6 +16,9 @@ from rtclient.models import (
     ItemCreateMessage,
 )
 
+# 增量消息逐条打印在流式速率下会占满事件循环，默认关闭；需要时设置该环境变量开启
+DEBUG = bool(os.environ.get("RTCLIENT_SAMPLE_DEBUG"))
+
 
 class MessageHandler:
     def __init__(self, client: RTLowLevelClient, shutdown_event: Optional[asyncio.Event] = None):
@@ -27,6 +31,25 @@ class MessageHandler:
         self.client = client
         self.shutdown_event = shutdown_event
         self._custom_handlers: dict[str, Callable] = {}
+        # 内置消息处理表：按消息类型一次哈希直达处理函数，避免逐个前缀/相等比较
+        self._handlers: dict[str, Callable] = {
+            "session.created": self._handle_session_created,
+            "session.updated": self._handle_session_updated,
+            "error": self._handle_error,
+            "input_audio_buffer.committed": self._handle_audio_committed,
+            "input_audio_buffer.speech_started": self._handle_speech_started,
+            "input_audio_buffer.speech_stopped": self._handle_speech_stopped,
+            "conversation.item.created": self._handle_item_created,
+            "conversation.item.input_audio_transcription.completed": self._handle_transcription_completed,
+            "response.created": self._handle_response_created,
+            "response.done": self._handle_response_done,
+            "response.audio.delta": self._handle_audio_delta,
+            "response.audio.done": self._handle_audio_done,
+            "response.audio_transcript.delta": self._handle_audio_transcript_delta,
+            "response.audio_transcript.done": self._handle_audio_transcript_done,
+            "response.function_call_arguments.done": self._handle_function_call,
+            "heartbeat": self._handle_heartbeat,
+        }
 
     def register_handler(self, message_type: str, handler: Callable):
         """
@@ -59,80 +82,115 @@ class MessageHandler:
             except json.JSONDecodeError as e:
                 print(f"解析函数调用参数失败: {e}")
 
-    async def _handle_session_messages(self, message: Any, msg_type: str):
-        """处理会话相关消息"""
-        match msg_type:
-            case "session.created":
-                print("会话创建消息")
-                print(f"  Session Id: {message.session.id}")
-            case "session.updated":
-                print("会话更新消息")
-                print(f"updated session: {message.session}")
-            case "error":
-                print("错误消息")
-                print(f"  Error: {message.error}")
-
-    async def _handle_audio_input_messages(self, message: Any, msg_type: str):
-        """处理音频输入相关消息"""
-        match msg_type:
-            case "input_audio_buffer.committed":
-                print("音频缓冲区提交消息")
-                if hasattr(message, "item_id"):
-                    print(f"  Item Id: {message.item_id}")
-            case "input_audio_buffer.speech_started":
-                print("语音开始消息")
-            case "input_audio_buffer.speech_stopped":
-                print("语音结束消息")
-
-    async def _handle_conversation_messages(self, message: Any, msg_type: str):
-        """处理会话项目相关消息"""
-        match msg_type:
-            case "conversation.item.created":
-                print("会话项目创建消息")
-            case "conversation.item.input_audio_transcription.completed":
-                print("输入音频转写完成消息")
-                print(f"  Transcript: {message.transcript}")
-
-    async def _handle_response_messages(self, message: Any, msg_type: str):
-        """处理响应相关消息"""
-        match msg_type:
-            case "response.created":
-                print("响应创建消息")
-                print(f"  Response Id: {message.response.id}")
-            case "response.done":
-                print("响应完成消息")
-                if hasattr(message, "response"):
-                    print(f"  Response Id: {message.response.id}")
-                    print(f"  Status: {message.response.status}")
-            case "response.audio.delta":
-                print("模型音频增量消息")
-                print(f"  Response Id: {message.response_id}")
-                if message.delta:
-                    print(f"  Delta Length: {len(message.delta)}")
-                else:
-                    print("  Delta: None")
-            case "response.audio.done":
-                print("模型音频完成消息")
-            case "response.audio_transcript.delta":
-                print("模型音频文本增量消息")
-                print(f"  Response Id: {message.response_id}")
-                print(f"  Delta: {message.delta if message.delta else 'None'}")
-            case "response.audio_transcript.done":
-                print("模型音频文本完成消息")
+    async def _handle_session_created(self, message: Any):
+        """处理会话创建消息"""
+        print("会话创建消息")
+        print(f"  Session Id: {message.session.id}")
+
+    async def _handle_session_updated(self, message: Any):
+        """处理会话更新消息"""
+        print("会话更新消息")
+        print(f"updated session: {message.session}")
+
+    async def _handle_error(self, message: Any):
+        """处理错误消息"""
+        print("错误消息")
+        print(f"  Error: {message.error}")
+
+    async def _handle_audio_committed(self, message: Any):
+        """处理音频缓冲区提交消息"""
+        print("音频缓冲区提交消息")
+        if hasattr(message, "item_id"):
+            print(f"  Item Id: {message.item_id}")
+
+    async def _handle_speech_started(self, message: Any):
+        """处理语音开始消息"""
+        print("语音开始消息")
+
+    async def _handle_speech_stopped(self, message: Any):
+        """处理语音结束消息"""
+        print("语音结束消息")
+
+    async def _handle_item_created(self, message: Any):
+        """处理会话项目创建消息"""
+        print("会话项目创建消息")
+
+    async def _handle_transcription_completed(self, message: Any):
+        """处理输入音频转写完成消息"""
+        print("输入音频转写完成消息")
+        print(f"  Transcript: {message.transcript}")
+
+    async def _handle_response_created(self, message: Any):
+        """处理响应创建消息"""
+        print("响应创建消息")
+        print(f"  Response Id: {message.response.id}")
+
+    async def _handle_response_done(self, message: Any):
+        """处理响应完成消息"""
+        print("响应完成消息")
+        if hasattr(message, "response"):
+            print(f"  Response Id: {message.response.id}")
+            print(f"  Status: {message.response.status}")
+
+    async def _handle_audio_delta(self, message: Any):
+        """处理模型音频增量消息"""
+        if not DEBUG:
+            return
+        print("模型音频增量消息")
+        print(f"  Response Id: {message.response_id}")
+        if message.delta:
+            print(f"  Delta Length: {len(message.delta)}")
+        else:
+            print("  Delta: None")
+
+    async def _handle_audio_done(self, message: Any):
+        """处理模型音频完成消息"""
+        print("模型音频完成消息")
+
+    async def _handle_audio_transcript_delta(self, message: Any):
+        """处理模型音频文本增量消息"""
+        if not DEBUG:
+            return
+        print("模型音频文本增量消息")
+        print(f"  Response Id: {message.response_id}")
+        print(f"  Delta: {message.delta if message.delta else 'None'}")
+
+    async def _handle_audio_transcript_done(self, message: Any):
+        """处理模型音频文本完成消息"""
+        print("模型音频文本完成消息")
+
+    async def _handle_heartbeat(self, message: Any):
+        """处理心跳消息"""
+        print("心跳消息")
 
     async def receive_messages(self):
         """
         统一的消息接收处理函数
         处理所有类型的消息，包括音频、视频、函数调用和服务端VAD等场景
         """
+        # 复用同一个shutdown等待任务；wait_for会为每条消息新建定时器和Task
+        shutdown_wait = asyncio.create_task(self.shutdown_event.wait()) if self.shutdown_event else None
         try:
             while not self.client.closed:
-                if self.shutdown_event and self.shutdown_event.is_set():
+                if shutdown_wait is not None and shutdown_wait.done():
                     print("正在停止消息接收...")
                     break
 
                 try:
-                    message = await asyncio.wait_for(self.client.recv(), timeout=5.0)
+                    if shutdown_wait is not None:
+                        recv_task = asyncio.create_task(self.client.recv())
+                        await asyncio.wait({recv_task, shutdown_wait}, return_when=asyncio.FIRST_COMPLETED)
+                        if not recv_task.done():
+                            print("正在停止消息接收...")
+                            recv_task.cancel()
+                            try:
+                                await recv_task
+                            except asyncio.CancelledError:
+                                pass
+                            break
+                        message = recv_task.result()
+                    else:
+                        message = await self.client.recv()
                     if message is None:
                         continue
 
@@ -141,35 +199,21 @@ class MessageHandler:
                         print("收到未知类型的消息:", message)
                         continue
 
-                    # 检查是否有自定义处理器
-                    if msg_type in self._custom_handlers:
-                        await self._custom_handlers[msg_type](message)
-                        continue
-
-                    if msg_type.startswith("session.") or msg_type == "error":
-                        await self._handle_session_messages(message, msg_type)
-                    elif msg_type.startswith("input_audio_buffer."):
-                        await self._handle_audio_input_messages(message, msg_type)
-                    elif msg_type.startswith("conversation.item."):
-                        await self._handle_conversation_messages(message, msg_type)
-                    elif msg_type.startswith("response."):
-                        if msg_type == "response.function_call_arguments.done":
-                            await self._handle_function_call(message)
-                        else:
-                            await self._handle_response_messages(message, msg_type)
-                    elif msg_type == "heartbeat":
-                        print("心跳消息")
+                    # 自定义处理器优先，其次查内置处理表
+                    handler = self._custom_handlers.get(msg_type) or self._handlers.get(msg_type)
+                    if handler is not None:
+                        await handler(message)
                     else:
                         print(f"未处理的消息类型: {msg_type}")
                         print(message)
 
-                except TimeoutError:
-                    continue  # 超时后继续尝试接收
                 except Exception as e:
                     if not self.shutdown_event or not self.shutdown_event.is_set():
                         print(f"接收消息时发生错误: {e}")
                     break
         finally:
+            if shutdown_wait is not None and not shutdown_wait.done():
+                shutdown_wait.cancel()
             if not self.client.closed:
                 await self.client.close()
                 print("WebSocket连接已关闭")
@@ -0,0 +1,54 @@
+# Copyright (c) ZhiPu Corporation.
+# Licensed under the MIT license.
+
+import asyncio
+import logging
+import os
+import random
+
+import pytest
+
+# 默认不配置root logger：全局DEBUG会把每次重连的日志推到stderr，
+# 写syscall加上logging的I/O锁在并行执行时会成为串行化点。
+# 本地需要详细日志时设置该环境变量开启。
+if os.environ.get("RTCLIENT_TEST_DEBUG"):
+    logging.basicConfig(level=logging.DEBUG)
+
+
+class FakeClock:
+    """虚拟时钟：把asyncio.sleep替换为只记录时长的空操作，退避测试不再消耗真实时间"""
+
+    def __init__(self):
+        self.sleeps: list[float] = []
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def reset_client(client, session, *, max_retries=3, initial_retry_delay=1.0, max_retry_delay=30.0):
+    """把同一个客户端实例复位后交给下一个场景使用
+
+    直接改写实例属性而不是在生产代码里加测试专用钩子：
+    清零重试状态、丢弃ws引用、重新接线mock session并按场景重置配置。
+    """
+    # 丢弃上一个用例留在实例上的方法覆盖（如用AsyncMock包装过的reconnect），
+    # 并换上全新的RNG，种子化退避测试的状态不会泄漏到后续用例
+    client.__dict__.pop("reconnect", None)
+    client._rng = random.Random()
+    client._session = session
+    client._max_retries = max_retries
+    client._initial_retry_delay = initial_retry_delay
+    client._max_retry_delay = max_retry_delay
+    client._retry_count = 0
+    client._last_delay = initial_retry_delay
+    client._reconnecting = False
+    client._prewarm_task = None
+    client.ws = None
+    return client
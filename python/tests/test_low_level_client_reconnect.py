@@ -0,0 +1,242 @@
+# Copyright (c) ZhiPu Corporation.
+# Licensed under the MIT license.
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from aiohttp import ClientError, ClientSession, ClientWebSocketResponse, RequestInfo, WSServerHandshakeError
+from conftest import reset_client
+
+from rtclient.low_level_client import ConnectionError, RTLowLevelClient
+
+# 模块级缓存的握手错误：spec限定的request_info和空tuple的history可在所有场景间共享，
+# 参数化矩阵不再为每个用例构造新的MagicMock
+_REQ_INFO = MagicMock(spec=RequestInfo)
+_HISTORY = ()
+HANDSHAKE_403 = WSServerHandshakeError(request_info=_REQ_INFO, history=_HISTORY, status=403)
+HANDSHAKE_500 = WSServerHandshakeError(request_info=_REQ_INFO, history=_HISTORY, status=500)
+
+# 发送场景共用的规范测试载荷，参数化运行时不再重复构造dict字面量
+PAYLOAD = {"test": "message"}
+
+
+def seq(*items):
+    """返回依次吐出items的异步可调用：异常项被抛出，其余作为返回值
+
+    绕过AsyncMock通用的参数规格与调用记录机制，长退避序列下每次重试更便宜；
+    调用次数记录在返回值的calls属性上。
+    """
+    iterator = iter(items)
+
+    async def f(*args, **kwargs):
+        f.calls += 1
+        value = next(iterator)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    f.calls = 0
+    return f
+
+
+def _make_ws(**attrs) -> AsyncMock:
+    """构造一个处于打开状态的WebSocket mock
+
+    spec_set把属性限定在ClientWebSocketResponse的真实接口上：拼错的属性名
+    直接报错，也不会在_mock_children里惰性堆积任意属性。
+    """
+    ws = AsyncMock(spec_set=ClientWebSocketResponse)
+    ws.closed = False
+    for name, value in attrs.items():
+        setattr(ws, name, value)
+    return ws
+
+
+@pytest.fixture(autouse=True, scope="module")
+def session_cls():
+    """整个模块只patch一次ClientSession/TCPConnector，免去每个用例的patch进出开销"""
+    with patch("rtclient.low_level_client.ClientSession") as mock_cls, patch("rtclient.low_level_client.TCPConnector"):
+        yield mock_cls
+
+
+@pytest.fixture(scope="module")
+def client_cache():
+    """模块内复用的客户端实例缓存，省去每个场景的构造开销"""
+    return {}
+
+
+@pytest.fixture
+def ws_client(session_cls, client_cache):
+    """共享的mock脚手架：为当前用例装上全新的session mock，返回构造客户端的工厂"""
+    session = AsyncMock(spec_set=ClientSession)
+    session_cls.return_value = session
+
+    def make_client(ws_connect_side_effect, **kwargs):
+        session.ws_connect = seq(*ws_connect_side_effect)
+        client = client_cache.get("client")
+        if client is None:
+            client = client_cache["client"] = RTLowLevelClient("wss://example.com/ws", **kwargs)
+        return reset_client(client, session, **kwargs), session
+
+    return make_client
+
+
+async def _scenario_connect_ok(make_client, clock):
+    """连接成功后ws可用"""
+    ws = _make_ws()
+    client, _ = make_client([ws])
+    await client.connect()
+    assert client.ws is ws
+    assert not client.closed
+    await client.close()
+
+
+async def _scenario_no_retry_403(make_client, clock):
+    """4xx握手失败不重试，直接抛出ConnectionError"""
+    client, session = make_client([HANDSHAKE_403], max_retries=3)
+    with pytest.raises(ConnectionError):
+        await client.connect()
+    assert session.ws_connect.calls == 1
+    assert clock.sleeps == []
+    await client.close()
+
+
+async def _scenario_retry_then_ok(make_client, clock):
+    """5xx握手失败退避后重试成功"""
+    ws = _make_ws()
+    client, session = make_client([HANDSHAKE_500, ws], max_retries=1, initial_retry_delay=0.1)
+    await client.connect()
+    assert client.ws is ws
+    assert session.ws_connect.calls == 2
+    # 去相关抖动的首个延迟落在[initial, initial*3]区间内
+    assert len(clock.sleeps) == 1
+    assert 0.1 <= clock.sleeps[0] <= 0.1 * 3
+    await client.close()
+
+
+async def _scenario_send_reconnect(make_client, clock):
+    """发送失败时自动重连，并在新连接上复用已序列化的载荷"""
+    dead_ws = _make_ws(send_str=AsyncMock(side_effect=ConnectionResetError()))
+    new_ws = _make_ws()
+    client, _ = make_client([dead_ws, new_ws])
+    await client.connect()
+    await client.send(PAYLOAD)
+    new_ws.send_str.assert_awaited_once()
+    assert orjson.loads(new_ws.send_str.await_args.args[0]) == PAYLOAD
+    await client.close()
+
+
+async def _scenario_recv_error(make_client, clock):
+    """接收时的连接级错误按连接关闭处理，返回None"""
+    ws = _make_ws(receive=AsyncMock(side_effect=ClientError()))
+    client, _ = make_client([ws])
+    await client.connect()
+    assert await client.recv() is None
+    await client.close()
+
+
+async def _scenario_aenter_failure_closes_session(make_client, clock):
+    """async with进入失败时释放session，不泄漏连接池"""
+    client, session = make_client([HANDSHAKE_403])
+    with pytest.raises(ConnectionError):
+        async with client:
+            pass
+    session.close.assert_awaited()
+
+
+SCENARIOS = {
+    "connect_ok": _scenario_connect_ok,
+    "no_retry_403": _scenario_no_retry_403,
+    "retry_then_ok": _scenario_retry_then_ok,
+    "send_reconnect": _scenario_send_reconnect,
+    "recv_error": _scenario_recv_error,
+    "aenter_failure_closes_session": _scenario_aenter_failure_closes_session,
+}
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+async def test_reconnect_matrix(ws_client, clock, scenario):
+    """在同一套mock脚手架下覆盖全部连接/重连场景"""
+    await SCENARIOS[scenario](ws_client, clock)
+
+
+async def test_send_invokes_reconnect_once(ws_client):
+    """发送失败只触发一次重连
+
+    包装reconnect时用显式的async side_effect，而不是返回协程的lambda技巧——
+    后者留下未await的协程，在-W error下变成RuntimeWarning。
+    """
+    dead_ws = _make_ws(send_str=AsyncMock(side_effect=ConnectionResetError()))
+    new_ws = _make_ws()
+    client, _ = ws_client([dead_ws, new_ws])
+    await client.connect()
+
+    original_reconnect = client.reconnect
+
+    async def fake_reconnect():
+        return await original_reconnect()
+
+    client.reconnect = AsyncMock(side_effect=fake_reconnect)
+    await client.send(PAYLOAD)
+
+    client.reconnect.assert_awaited_once()
+    new_ws.send_str.assert_awaited_once()
+    await client.close()
+
+
+async def test_prewarm_then_connect(ws_client):
+    """prewarm提前发起握手，connect直接复用后台任务的结果"""
+    ws = _make_ws()
+    client, session = ws_client([ws])
+
+    task = client.prewarm()
+    # 重复调用不会再发起新的握手，返回同一个后台任务
+    assert client.prewarm() is task
+
+    await client.connect()
+    assert client.ws is ws
+    assert session.ws_connect.calls == 1
+    assert client._prewarm_task is None
+    await client.close()
+
+
+async def test_prewarm_then_close(ws_client):
+    """未connect就close时，仍在握手中的后台任务被取消，不在事件循环里残留"""
+    started = asyncio.Event()
+
+    async def hanging_connect(*args, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    client, session = ws_client([])
+    session.ws_connect = hanging_connect
+    prewarm_task = client.prewarm()
+    await started.wait()
+
+    await client.close()
+    assert prewarm_task.cancelled()
+    assert client._prewarm_task is None
+
+
+async def test_backoff_schedule_with_seeded_rng(ws_client, clock):
+    """连续8次5xx后成功：用种子RNG精确断言整条退避序列，全程零真实等待"""
+    ws = _make_ws()
+    client, session = ws_client([HANDSHAKE_500] * 8 + [ws], max_retries=8, initial_retry_delay=1.0)
+    client._rng = random.Random(0)
+
+    await client.connect()
+
+    assert client.ws is ws
+    assert session.ws_connect.calls == 9
+    # 用相同种子复算去相关抖动规则：delay = min(cap, uniform(initial, last * 3))
+    rng = random.Random(0)
+    expected = []
+    last = 1.0
+    for _ in range(8):
+        last = min(30.0, rng.uniform(1.0, last * 3))
+        expected.append(last)
+    assert clock.sleeps == pytest.approx(expected)
+    await client.close()